@@ -1,140 +1,254 @@
 import os
 import sys
+import fnmatch
 import threading
 import queue
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, Iterator, List, Optional, Dict, Tuple
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import re
+from itertools import chain, groupby
+from functools import lru_cache
+
+EXTENSION_TAGS = {
+    '.py': 'python', '.pyw': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.html': 'html', '.htm': 'html',
+    '.css': 'css',
+    '.md': 'markdown', '.markdown': 'markdown',
+    '.json': 'config', '.yaml': 'config', '.yml': 'config', '.toml': 'config', '.ini': 'config',
+}
+
+STAT_BATCH_SIZE = 64
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+@lru_cache(maxsize=256)
+def _glob_re(pattern: str):
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
 
 class TreeVisualizer:
-    def __init__(self, show_hidden: bool = False, max_depth: Optional[int] = None, exclude_patterns: List[str] = None):
+    def __init__(self, show_hidden: bool = False, max_depth: Optional[int] = None, exclude_patterns: List[str] = None, max_workers: int = 16):
         self.show_hidden = show_hidden
         self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.progress_count = 0
+        self._progress_lock = threading.Lock()
         self.exclude_patterns = exclude_patterns or ['__pycache__', '.git', '.DS_Store', '.pytest_cache', 'node_modules']
-        
-    def should_exclude(self, name: str) -> bool:
-        if not self.show_hidden and name.startswith('.'):
-            return True
-        return any(pattern in name for pattern in self.exclude_patterns)
+        self._exclude_set = frozenset(self.exclude_patterns)
+        self._exclude_re = re.compile('|'.join(map(re.escape, self.exclude_patterns)))
+        self.should_exclude = self._make_exclude_check()
+        
+    def _make_exclude_check(self) -> Callable[[str], bool]:
+        exclude_set = self._exclude_set
+        search = self._exclude_re.search
+        if self.show_hidden:
+            return lambda name: name in exclude_set or search(name) is not None
+        return lambda name: name[:1] == '.' or name in exclude_set or search(name) is not None
     
-    def get_tree_lines(self, root_dir: Path, prefix: str = "", is_last: bool = True, depth: int = 0, progress_queue: Optional[queue.Queue] = None) -> List[str]:
-        if self.max_depth is not None and depth > self.max_depth:
-            return []
-            
+    def _add_progress(self, count: int):
+        with self._progress_lock:
+            self.progress_count += count
+    
+    def _scan_dir(self, path: str) -> Optional[List[Tuple[int, str, str, str, bool]]]:
+        should_exclude = self.should_exclude
         try:
-            items = list(root_dir.iterdir())
+            with os.scandir(path) as it:
+                entries = [(0 if entry.is_dir() else 1, entry.name.lower(), entry.name, entry.path, entry.is_symlink()) for entry in it if not should_exclude(entry.name)]
         except (PermissionError, OSError):
-            return [f"{prefix}└── [Permission Denied]"]
+            return None
         
-        items = [item for item in items if not self.should_exclude(item.name)]
+        self._add_progress(len(entries))
+        entries.sort()
+        return entries
+    
+    def _scan_task(self, executor: ThreadPoolExecutor, path: str, depth: int):
+        scan = self._scan_dir(path)
+        children = {}
+        
+        if scan is not None and (self.max_depth is None or depth < self.max_depth):
+            submit = executor.submit
+            scan_task = self._scan_task
+            for is_file, _, name, child_path, is_link in scan:
+                if is_file:
+                    break
+                if is_link:
+                    continue
+                children[child_path] = submit(scan_task, executor, child_path, depth + 1)
         
-        if progress_queue:
-            progress_queue.put(('progress', len(items)))
+        return scan, children
+    
+    def _expand_dir(self, future: Future, prefix: str, is_last: bool) -> List[Tuple[str, Optional[str], Optional[Future], str, bool]]:
+        scan, children = future.result()
+        if scan is None:
+            return [(f"{prefix}└── [Permission Denied]", None, None, prefix, True)]
         
-        dirs = sorted([item for item in items if item.is_dir()], key=lambda x: x.name.lower())
-        files = sorted([item for item in items if item.is_file()], key=lambda x: x.name.lower())
-        sorted_items = dirs + files
+        line_prefix = prefix + "├── "
+        next_prefix = prefix + ("    " if is_last else "│   ")
         
-        lines = []
+        child_future = children.get
+        tag_for = EXTENSION_TAGS.get
+        splitext = os.path.splitext
         
-        for i, item in enumerate(sorted_items):
-            is_last_item = (i == len(sorted_items) - 1)
-            
+        entries = [(line_prefix + name, tag_for(splitext(name)[1].lower()) if is_file else 'directory', child_future(path), next_prefix, False) for is_file, _, name, path, _ in scan]
+        
+        if entries:
+            line, tag, child, child_prefix, _ = entries[-1]
             if is_last:
-                connector = "└── " if is_last_item else "├── "
-                next_prefix = prefix + "    "
-            else:
-                connector = "├── " if is_last_item else "├── "
-                next_prefix = prefix + "│   "
-            
-            lines.append(f"{prefix}{connector}{item.name}")
-            
-            if item.is_dir():
-                child_lines = self.get_tree_lines(item, next_prefix, is_last_item, depth + 1, progress_queue)
-                lines.extend(child_lines)
+                line = prefix + "└── " + line[len(line_prefix):]
+            entries[-1] = (line, tag, child, child_prefix, True)
         
-        return lines
+        return entries
     
-    def visualize(self, root_path: Path, progress_queue: Optional[queue.Queue] = None) -> str:
+    def get_tree_lines(self, root_dir: str) -> Iterator[Tuple[str, Optional[str]]]:
+        self.progress_count = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            root_future = executor.submit(self._scan_task, executor, root_dir, 0)
+            expand_dir = self._expand_dir
+            stack = expand_dir(root_future, "", True)
+            stack.reverse()
+            pop = stack.pop
+            extend = stack.extend
+            
+            while stack:
+                line, tag, future, next_prefix, is_last = pop()
+                yield line, tag
+                
+                if future is not None:
+                    entries = expand_dir(future, next_prefix, is_last)
+                    entries.reverse()
+                    extend(entries)
+    
+    def _make_chunk(self, lines: List[str], tags: List[Optional[str]], continues: bool) -> Tuple[str, List[Tuple[str, int, int]]]:
+        tag_runs = []
+        start = 0
+        for tag, run in groupby(tags):
+            end = start + sum(1 for _ in run) - 1
+            if tag:
+                tag_runs.append((tag, start, end))
+            start = end + 1
+        
+        text = "\n".join(lines)
+        return ("\n" + text if continues else text), tag_runs
+    
+    def visualize(self, root_path: Path, chunk_size: int = 8192) -> Iterator[Tuple[str, List[Tuple[str, int, int]]]]:
         root_name = root_path.name if root_path.name else str(root_path)
-        lines = [root_name + "/"]
-        
-        tree_lines = self.get_tree_lines(root_path, "", True, 0, progress_queue)
-        lines.extend(tree_lines)
-        
-        return "\n".join(lines)
+        tree_lines = chain([(root_name + "/", 'directory')], self.get_tree_lines(os.fspath(root_path)))
+        
+        lines, tags, size = [], [], 0
+        continues = False
+        for line, tag in tree_lines:
+            lines.append(line)
+            tags.append(tag)
+            size += len(line) + 1
+            if size >= chunk_size:
+                yield self._make_chunk(lines, tags, continues)
+                lines, tags, size = [], [], 0
+                continues = True
+        
+        if lines:
+            yield self._make_chunk(lines, tags, continues)
     
-    def search_files(self, root_path: Path, search_pattern: str, progress_queue: Optional[queue.Queue] = None) -> List[Dict]:
-        results = []
+    def search_files(self, root_path: Path, search_pattern: str) -> List[Dict]:
+        self.progress_count = 0
+        hits = []
         search_lower = search_pattern.lower()
         
-        if '*' in search_pattern or '?' in search_pattern:
-            regex_pattern = search_lower.replace('.', '\\.')
-            regex_pattern = regex_pattern.replace('*', '.*')
-            regex_pattern = regex_pattern.replace('?', '.')
-            regex_pattern = f"^{regex_pattern}$"
-            pattern_re = re.compile(regex_pattern)
-        else:
-            pattern_re = None
+        pattern_re = _glob_re(search_pattern) if any(c in search_pattern for c in '*?[') else None
+        match = pattern_re.match if pattern_re else None
         
-        def search_recursive(current_path: Path, depth: int = 0):
-            if self.max_depth is not None and depth > self.max_depth:
-                return
-                
+        root_str = os.fspath(root_path)
+        root_prefix = os.path.join(root_str, '')
+        root_prefix_len = len(root_prefix)
+        hits_lock = threading.Lock()
+        should_exclude = self.should_exclude
+        add_progress = self._add_progress
+        max_depth = self.max_depth
+        format_size = self._format_size
+        format_mtime = self._format_mtime
+        
+        def search_task(executor: ThreadPoolExecutor, current_path: str, depth: int = 0) -> List[Future]:
             try:
-                items = list(current_path.iterdir())
+                with os.scandir(current_path) as it:
+                    entries = [entry for entry in it if not should_exclude(entry.name)]
             except (PermissionError, OSError):
-                return
+                return []
             
-            if progress_queue:
-                progress_queue.put(('progress', len(items)))
+            add_progress(len(entries))
             
-            for item in items:
-                if self.should_exclude(item.name):
-                    continue
-                    
-                item_lower = item.name.lower()
-                matches = False
-                
-                if pattern_re:
-                    matches = pattern_re.search(item_lower) is not None
+            matched = []
+            children = []
+            add_match = matched.append
+            add_child = children.append
+            submit = executor.submit
+            descend = max_depth is None or depth < max_depth
+            
+            for entry in entries:
+                name = entry.name
+                if match is not None:
+                    matches = match(name) is not None
                 else:
-                    matches = search_lower in item_lower
+                    matches = search_lower in name.lower()
                 
                 if matches:
-                    rel_path = item.relative_to(root_path) if item != root_path else Path(item.name)
-                    results.append({
-                        'name': item.name,
-                        'path': str(item),
-                        'relative_path': str(rel_path),
-                        'type': 'directory' if item.is_dir() else 'file',
-                        'size': self._get_size(item) if item.is_file() else None,
-                        'modified': self._get_modified_time(item)
-                    })
+                    add_match(entry)
                 
-                if item.is_dir():
-                    search_recursive(item, depth + 1)
+                if descend and entry.is_dir(follow_symlinks=False):
+                    add_child(submit(search_task, executor, entry.path, depth + 1))
+            
+            if matched:
+                with hits_lock:
+                    hits.extend(matched)
+            
+            return children
+        
+        def describe(batch: List[os.DirEntry]) -> List[Dict]:
+            described = []
+            for entry in batch:
+                path = entry.path
+                is_dir = entry.is_dir()
+                try:
+                    st = entry.stat()
+                    size = format_size(st.st_size) if entry.is_file() else None
+                    modified = format_mtime(st.st_mtime)
+                except OSError:
+                    size = None
+                    modified = "Unknown"
+                described.append({
+                    'name': entry.name,
+                    'path': path,
+                    'relative_path': path[root_prefix_len:] if path.startswith(root_prefix) else entry.name,
+                    'type': 'directory' if is_dir else 'file',
+                    'size': size,
+                    'modified': modified
+                })
+            return described
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = [executor.submit(search_task, executor, root_str)]
+            while pending:
+                pending.extend(pending.pop().result())
+            
+            hits.sort(key=lambda entry: entry.path)
+            if len(hits) > STAT_BATCH_SIZE:
+                batches = [hits[i:i + STAT_BATCH_SIZE] for i in range(0, len(hits), STAT_BATCH_SIZE)]
+                results = list(chain.from_iterable(executor.map(describe, batches)))
+            else:
+                results = describe(hits)
         
-        search_recursive(root_path)
         return results
     
-    def _get_size(self, file_path: Path) -> str:
-        size = file_path.stat().st_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+    def _format_size(self, size: int) -> str:
+        if size < 1024:
+            return f"{size} B"
+        k = min((size.bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size / (1 << (k * 10)):.1f} {SIZE_UNITS[k]}"
     
-    def _get_modified_time(self, path: Path) -> str:
-        try:
-            mtime = path.stat().st_mtime
-            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime))
-        except:
-            return "Unknown"
+    def _format_mtime(self, mtime: float) -> str:
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime))
 
 class FileStructureCreator:
     def __init__(self):
@@ -144,8 +258,13 @@ class FileStructureCreator:
         
         self.current_path = None
         self.visualizer = TreeVisualizer()
-        self.progress_queue = queue.Queue()
+        self.progress_queue = queue.Queue(maxsize=64)
+        self.search_queue = queue.SimpleQueue()
+        self.save_queue = queue.SimpleQueue()
         self.is_processing = False
+        self.tree_line_count = 0
+        self.tree_chunks = []
+        self.search_results = None
         
         self.setup_gui()
         
@@ -219,6 +338,14 @@ class FileStructureCreator:
         self.tree_text = scrolledtext.ScrolledText(tree_frame, wrap=tk.NONE, font=('Consolas', 10))
         self.tree_text.pack(fill=tk.BOTH, expand=True)
         
+        self.tree_text.tag_configure('directory', foreground='blue')
+        self.tree_text.tag_configure('python', foreground='green')
+        self.tree_text.tag_configure('javascript', foreground='orange')
+        self.tree_text.tag_configure('html', foreground='red')
+        self.tree_text.tag_configure('css', foreground='purple')
+        self.tree_text.tag_configure('markdown', foreground='darkblue')
+        self.tree_text.tag_configure('config', foreground='brown')
+        
         search_tab = ttk.Frame(self.notebook)
         self.notebook.add(search_tab, text="Search Results")
         
@@ -276,6 +403,9 @@ class FileStructureCreator:
         self.progress_bar.start()
         self.tree_text.delete(1.0, tk.END)
         self.tree_text.insert(tk.END, "Generating tree structure...\n")
+        self.tree_line_count = 0
+        self.tree_chunks = []
+        self.progress_queue = queue.Queue(maxsize=64)
         
         depth_str = self.depth_var.get()
         max_depth = None if depth_str == "Unlimited" else int(depth_str)
@@ -288,70 +418,59 @@ class FileStructureCreator:
             exclude_patterns=exclude_patterns
         )
         
-        thread = threading.Thread(target=self._generate_tree_thread)
+        thread = threading.Thread(target=self._generate_tree_thread, args=(self.visualizer, self.current_path, self.progress_queue))
         thread.daemon = True
         thread.start()
         
         self.root.after(100, self._monitor_progress)
     
-    def _generate_tree_thread(self):
+    def _generate_tree_thread(self, visualizer, root_path, chunk_queue):
         try:
-            tree = self.visualizer.visualize(self.current_path, self.progress_queue)
-            self.progress_queue.put(('done', tree))
+            for chunk in visualizer.visualize(root_path):
+                chunk_queue.put(('chunk', chunk))
+            chunk_queue.put(('done', None))
         except Exception as e:
-            self.progress_queue.put(('error', str(e)))
+            chunk_queue.put(('error', str(e)))
+    
+    def _show_progress_count(self):
+        self.progress_label.config(text=f"{self.visualizer.progress_count:,} items scanned")
     
     def _monitor_progress(self):
+        self._show_progress_count()
         try:
-            while True:
-                msg_type, data = self.progress_queue.get_nowait()
-                
-                if msg_type == 'progress':
-                    pass
-                elif msg_type == 'done':
-                    self._update_tree_display(data)
-                    break
-                elif msg_type == 'error':
-                    self._show_error(data)
-                    break
-                    
+            msg_type, data = self.progress_queue.get_nowait()
         except queue.Empty:
             if self.is_processing:
                 self.root.after(100, self._monitor_progress)
+            return
+        
+        if msg_type == 'chunk':
+            self._append_tree_chunk(data)
+            self.root.after_idle(self._monitor_progress)
+        elif msg_type == 'done':
+            self._finish_tree_generation()
+        elif msg_type == 'error':
+            self._show_error(data)
+        else:
+            self.root.after_idle(self._monitor_progress)
     
-    def _update_tree_display(self, tree_text):
-        self.tree_text.delete(1.0, tk.END)
-        self.tree_text.insert(tk.END, tree_text)
+    def _append_tree_chunk(self, chunk):
+        text, tag_runs = chunk
+        line_count = text.count("\n")
+        if self.tree_line_count == 0:
+            self.tree_text.delete(1.0, tk.END)
+            line_count += 1
         
-        self.tree_text.tag_configure('directory', foreground='blue')
-        self.tree_text.tag_configure('python', foreground='green')
-        self.tree_text.tag_configure('javascript', foreground='orange')
-        self.tree_text.tag_configure('html', foreground='red')
-        self.tree_text.tag_configure('css', foreground='purple')
-        self.tree_text.tag_configure('markdown', foreground='darkblue')
-        self.tree_text.tag_configure('config', foreground='brown')
+        offset = self.tree_line_count + 1
+        self.tree_text.insert(tk.END, text)
+        self.tree_chunks.append(text)
         
-        content = self.tree_text.get(1.0, tk.END)
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            if '/' in line and line.strip().endswith('/'):
-                start_idx = f"{i}.0"
-                end_idx = f"{i}.end"
-                self.tree_text.tag_add('directory', start_idx, end_idx)
-            elif any(ext in line.lower() for ext in ['.py', '.pyw']):
-                self.tree_text.tag_add('python', f"{i}.0", f"{i}.end")
-            elif any(ext in line.lower() for ext in ['.js', '.jsx', '.ts', '.tsx']):
-                self.tree_text.tag_add('javascript', f"{i}.0", f"{i}.end")
-            elif any(ext in line.lower() for ext in ['.html', '.htm']):
-                self.tree_text.tag_add('html', f"{i}.0", f"{i}.end")
-            elif '.css' in line.lower():
-                self.tree_text.tag_add('css', f"{i}.0", f"{i}.end")
-            elif any(ext in line.lower() for ext in ['.md', '.markdown']):
-                self.tree_text.tag_add('markdown', f"{i}.0", f"{i}.end")
-            elif any(ext in line.lower() for ext in ['.json', '.yaml', '.yml', '.toml', '.ini']):
-                self.tree_text.tag_add('config', f"{i}.0", f"{i}.end")
+        for tag, start, end in tag_runs:
+            self.tree_text.tag_add(tag, f"{offset + start}.0", f"{offset + end}.end")
         
+        self.tree_line_count += line_count
+    
+    def _finish_tree_generation(self):
         self.status_label.config(text="Tree generated successfully")
         self.progress_bar.stop()
         self.is_processing = False
@@ -368,13 +487,17 @@ class FileStructureCreator:
         if not search_pattern:
             messagebox.showwarning("No Pattern", "Please enter a search pattern.")
             return
+        
+        if self.is_processing:
+            messagebox.showwarning("Busy", "Please wait for the current operation to finish.")
+            return
             
         self.is_processing = True
         self.status_label.config(text=f"Searching for '{search_pattern}'...")
         self.progress_bar.start()
         
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        self.search_results = None
+        self.results_tree.delete(*self.results_tree.get_children())
         
         depth_str = self.depth_var.get()
         max_depth = None if depth_str == "Unlimited" else int(depth_str)
@@ -389,19 +512,18 @@ class FileStructureCreator:
     
     def _search_files_thread(self, search_pattern):
         try:
-            results = self.visualizer.search_files(self.current_path, search_pattern, self.progress_queue)
-            self.progress_queue.put(('search_done', results))
+            results = self.visualizer.search_files(self.current_path, search_pattern)
+            self.search_queue.put(('search_done', results))
         except Exception as e:
-            self.progress_queue.put(('error', str(e)))
+            self.search_queue.put(('error', str(e)))
     
     def _monitor_search_progress(self):
+        self._show_progress_count()
         try:
             while True:
-                msg_type, data = self.progress_queue.get_nowait()
+                msg_type, data = self.search_queue.get_nowait()
                 
-                if msg_type == 'progress':
-                    pass
-                elif msg_type == 'search_done':
+                if msg_type == 'search_done':
                     self._update_search_results(data)
                     break
                 elif msg_type == 'error':
@@ -416,10 +538,20 @@ class FileStructureCreator:
         self.status_label.config(text=f"Found {len(results)} results")
         self.progress_bar.stop()
         self.is_processing = False
+        self.progress_label.config(text="")
         
         self.search_info.config(text=f"Found {len(results)} matches\nPattern: {self.search_var.get()}\nFolder: {self.current_path.name}")
         
-        for result in results:
+        self.search_results = results
+        self._insert_search_results(results, 0)
+        
+        self.notebook.select(1)
+    
+    def _insert_search_results(self, results, start, batch_size=500):
+        if results is not self.search_results:
+            return
+        
+        for result in results[start:start + batch_size]:
             self.results_tree.insert('', tk.END, values=(
                 result['name'],
                 result['type'],
@@ -428,7 +560,8 @@ class FileStructureCreator:
                 result['relative_path']
             ))
         
-        self.notebook.select(1)
+        if start + batch_size < len(results):
+            self.root.after(1, self._insert_search_results, results, start + batch_size)
     
     def open_result_location(self, event):
         selection = self.results_tree.selection()
@@ -470,12 +603,8 @@ class FileStructureCreator:
     def _save_to_file(self, file_path):
         self.status_label.config(text="Saving to file...")
         self.progress_bar.start()
-        
-        def save_thread():
-            try:
-                tree_text = self.tree_text.get(1.0, tk.END)
-                
-                metadata = f"""# File Structure Creator - Created by .nikye. on Discord
+        tree_chunks = tuple(self.tree_chunks)
+        metadata = f"""# File Structure Creator - Created by .nikye. on Discord
 # GitHub: https://github.com/nikyebabft
 # 
 # File Structure: {self.current_path}
@@ -483,13 +612,17 @@ class FileStructureCreator:
 # Options: {'Show hidden' if self.visualizer.show_hidden else 'Hide hidden'}, Max depth: {self.visualizer.max_depth or 'Unlimited'}
 
 """
+        
+        def save_thread():
+            try:
+                with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write(metadata)
+                    f.writelines(tree_chunks)
+                    f.write("\n")
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(metadata + tree_text)
-                
-                self.progress_queue.put(('save_done', file_path))
+                self.save_queue.put(('save_done', file_path))
             except Exception as e:
-                self.progress_queue.put(('error', str(e)))
+                self.save_queue.put(('error', str(e)))
         
         thread = threading.Thread(target=save_thread)
         thread.daemon = True
@@ -499,7 +632,7 @@ class FileStructureCreator:
     
     def _monitor_save_progress(self):
         try:
-            msg_type, data = self.progress_queue.get_nowait()
+            msg_type, data = self.save_queue.get_nowait()
             
             if msg_type == 'save_done':
                 self.status_label.config(text="File saved successfully")
@@ -516,6 +649,7 @@ class FileStructureCreator:
         self.status_label.config(text="Error occurred")
         self.progress_bar.stop()
         self.is_processing = False
+        self.progress_label.config(text="")
         messagebox.showerror("Error", str(error_msg))
     
     def run(self):